@@ -1,18 +1,21 @@
  (cd "$(git rev-parse --show-toplevel)" && git apply --3way <<'EOF' 
 diff --git a/rename_tool.py b/rename_tool.py
 new file mode 100644
-index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6612d68b5
+index 0000000000000000000000000000000000000000..32717ff4535c95b1a05b42c29dd86500e52d5cf7
 --- /dev/null
 +++ b/rename_tool.py
-@@ -0,0 +1,448 @@
+@@ -0,0 +1,984 @@
 +"""Desktop filename renaming utility with replacement rules and EXIF-aware templates."""
 +from __future__ import annotations
 +
 +import importlib
++import io
 +import os
++import re
++import struct
 +import sys
-+from dataclasses import dataclass
-+from typing import Dict, List, Optional, Tuple
++from dataclasses import dataclass, field, replace
++from typing import Dict, List, Optional, Pattern, Tuple
 +
 +if importlib.util.find_spec("PIL") is not None:  # pragma: no cover - environment dependent
 +    from PIL import Image, ExifTags  # type: ignore
@@ -20,7 +23,39 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +    Image = None  # type: ignore
 +    ExifTags = None  # type: ignore
 +
-+from PyQt6.QtCore import Qt
++if importlib.util.find_spec("numba") is not None:  # pragma: no cover - environment dependent
++    import numpy as np  # type: ignore
++    from numba import njit  # type: ignore
++else:  # pragma: no cover - numba only speeds up the EXIF byte walk
++    np = None  # type: ignore
++    njit = None  # type: ignore
++
++_EXIF_TAG_IDS: Dict[str, int] = {v: k for k, v in ExifTags.TAGS.items()} if ExifTags is not None else {}
++_TAG_DTO = _EXIF_TAG_IDS.get("DateTimeOriginal")
++_TAG_DT = _EXIF_TAG_IDS.get("DateTime")
++_TAG_DTD = _EXIF_TAG_IDS.get("DateTimeDigitized")
++
++_PLACEHOLDER_RE = re.compile(r'<EXIF_date>|<EXIF_datetime>|<ORIGINAL>|<EXT>|###')
++_EXIF_READ_LIMIT = 128 * 1024
++
++# Raw TIFF tag ids used by the direct APP1 parser; independent of Pillow being installed.
++_TIFF_DATETIME_ORIGINAL = 0x9003
++_TIFF_DATETIME = 0x0132
++_TIFF_DATETIME_DIGITIZED = 0x9004
++_TIFF_EXIF_IFD = 0x8769
++_TIFF_ASCII = 2
++
++from PyQt6.QtCore import (
++    QAbstractTableModel,
++    QEvent,
++    QModelIndex,
++    QObject,
++    QRunnable,
++    Qt,
++    QThreadPool,
++    QTimer,
++    pyqtSignal,
++)
 +from PyQt6.QtWidgets import (
 +    QApplication,
 +    QDialog,
@@ -31,14 +66,193 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +    QLineEdit,
 +    QMessageBox,
 +    QPushButton,
-+    QTableWidget,
-+    QTableWidgetItem,
++    QStyle,
++    QStyledItemDelegate,
++    QStyleOptionButton,
++    QTableView,
 +    QTextEdit,
 +    QVBoxLayout,
 +    QWidget,
 +)
 +
 +
++def _rules_are_independent(rules: List[Tuple[str, str]]) -> bool:
++    """Return True when one alternation pass gives the same result as sequential replaces.
++
++    That holds when the needles are distinct, non-empty and cannot overlap each other, and
++    no replacement can produce (or, by deleting text, expose) a needle of a later rule.
++    """
++    finds = [find for find, _ in rules]
++    if not all(finds) or len(set(finds)) != len(finds):
++        return False
++    for a in finds:
++        for b in finds:
++            if a == b:
++                continue
++            if a in b or any(b.startswith(a[i:]) for i in range(1, len(a))):
++                return False
++    for i, (_, replacement) in enumerate(rules[:-1]):
++        if not replacement:
++            return False
++        if any(set(find) & set(replacement) for find in finds[i + 1:]):
++            return False
++    return True
++
++
++def _read_exif_fast(file_path: str):
++    """Read EXIF from the first 128 KB of the file, falling back to a full open if needed.
++
++    The APP1 segment of a JPEG sits right after SOI, so the head is usually enough; TIFF-based
++    formats may place their IFDs further in, in which case Pillow reads the whole file.
++    """
++    with open(file_path, 'rb') as fh:
++        head = fh.read(_EXIF_READ_LIMIT)
++        truncated = os.fstat(fh.fileno()).st_size > len(head)
++    try:
++        with Image.open(io.BytesIO(head)) as img:
++            exif = img.getexif()
++        if exif or not truncated:
++            return _merge_exif_ifd(exif)
++    except Exception:
++        if not truncated:
++            raise
++    with Image.open(file_path) as img:
++        return _merge_exif_ifd(img.getexif())
++
++
++def _merge_exif_ifd(exif) -> Dict[int, object]:
++    """Flatten IFD0 and the Exif sub-IFD into one dict, sub-IFD values winning.
++
++    getexif() only exposes IFD0, while DateTimeOriginal and DateTimeDigitized live in the Exif
++    sub-IFD; merging them gives the same tag lookup as the direct APP1 parser.
++    """
++    tags: Dict[int, object] = dict(exif)
++    if exif:
++        tags.update(exif.get_ifd(_TIFF_EXIF_IFD))
++    return tags
++
++
++def _jit(func):
++    return njit(cache=True)(func) if njit is not None else func
++
++
++@_jit
++def _read_uint(buf, pos, size, little):
++    value = 0
++    for i in range(size):
++        byte = int(buf[pos + i])
++        if little:
++            value |= byte << (8 * i)
++        else:
++            value = (value << 8) | byte
++    return value
++
++
++@_jit
++def _parse_app1(tiff):
++    """Locate the preferred timestamp in the TIFF block of an Exif APP1 segment.
++
++    Works on ``bytes`` or, when numba is installed, on a uint8 array in nopython mode; only the
++    byte walk lives here so file I/O and decoding stay in Python. Returns ``(offset, length)`` of
++    the ASCII value without its NUL terminator, ``(0, 0)`` if the block holds no timestamp and
++    ``(-1, 0)`` if it is not a TIFF structure this parser understands.
++    """
++    n = len(tiff)
++    if n < 8:
++        return -1, 0
++    if tiff[0] == 0x49 and tiff[1] == 0x49:
++        little = True
++    elif tiff[0] == 0x4D and tiff[1] == 0x4D:
++        little = False
++    else:
++        return -1, 0
++
++    # Slots in lookup priority order: DateTimeOriginal, DateTime, DateTimeDigitized.
++    offsets = [-1, -1, -1]
++    lengths = [0, 0, 0]
++    ifd = _read_uint(tiff, 4, 4, little)
++    exif_ifd = 0
++    for depth in range(2):
++        if depth == 1:
++            if exif_ifd == 0:
++                break
++            ifd = exif_ifd
++        # An IFD or entry table running past the segment is a layout this parser does not handle.
++        if ifd + 2 > n:
++            return -1, 0
++        count = _read_uint(tiff, ifd, 2, little)
++        for i in range(count):
++            entry = ifd + 2 + 12 * i
++            if entry + 12 > n:
++                return -1, 0
++            tag = _read_uint(tiff, entry, 2, little)
++            if tag == _TIFF_EXIF_IFD:
++                exif_ifd = _read_uint(tiff, entry + 8, 4, little)
++                continue
++            if _read_uint(tiff, entry + 2, 2, little) != _TIFF_ASCII:
++                continue
++            if tag == _TIFF_DATETIME_ORIGINAL:
++                slot = 0
++            elif tag == _TIFF_DATETIME:
++                slot = 1
++            elif tag == _TIFF_DATETIME_DIGITIZED:
++                slot = 2
++            else:
++                continue
++            length = _read_uint(tiff, entry + 4, 4, little)
++            start = entry + 8 if length <= 4 else _read_uint(tiff, entry + 8, 4, little)
++            end = min(start + length, n)
++            stop = start
++            while stop < end and tiff[stop] != 0:
++                stop += 1
++            if stop > start:
++                offsets[slot] = start
++                lengths[slot] = stop - start
++
++    for slot in range(3):
++        if offsets[slot] >= 0:
++            return offsets[slot], lengths[slot]
++    return 0, 0
++
++
++def _fast_exif_datetime(file_path: str) -> Optional[str]:
++    """Return a JPEG's EXIF timestamp by walking the APP1 TIFF IFDs directly, without Pillow.
++
++    DateTimeOriginal, DateTime and DateTimeDigitized are tried in that order. An empty string
++    means the EXIF block was parsed but holds no timestamp; None means the file could not be
++    handled here (not a JPEG, no EXIF segment, unusual layout) and the caller should use Pillow.
++    """
++    with open(file_path, 'rb') as fh:
++        if fh.read(2) != b'\xff\xd8':
++            return None
++        while True:
++            header = fh.read(4)
++            if len(header) < 4 or header[0] != 0xFF:
++                return None
++            marker = header[1]
++            if marker in (0xDA, 0xD9):  # SOS / EOI: metadata segments are over
++                return None
++            length = struct.unpack('>H', header[2:])[0]
++            if length < 2:
++                return None
++            if marker == 0xE1:
++                segment = fh.read(length - 2)
++                if segment[:6] == b'Exif\0\0':
++                    tiff = segment[6:]
++                    break
++            else:
++                fh.seek(length - 2, os.SEEK_CUR)
++
++    offset, length = _parse_app1(np.frombuffer(tiff, dtype=np.uint8) if np is not None else tiff)
++    if offset < 0:
++        return None
++    return tiff[offset:offset + length].decode('ascii', errors='ignore')
++
++
++def _template_needs_exif(template: str) -> bool:
++    return '<EXIF_date>' in template or '<EXIF_datetime>' in template
++
++
 +@dataclass
 +class FileInfo:
 +    """Container tracking original and current filenames along with custom template."""
@@ -47,9 +261,22 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +    current_name: str
 +    custom_template: Optional[str] = None
 +    preview_name: str = ""
++    # splitext() results cached for the template renderer; kept in sync by set_current_name().
++    orig_stem: str = field(init=False, repr=False)
++    orig_ext: str = field(init=False, repr=False)
++    current_stem: str = field(init=False, repr=False)
++    current_ext: str = field(init=False, repr=False)
++
++    def __post_init__(self) -> None:
++        self.orig_stem, self.orig_ext = os.path.splitext(self.original_name)
++        self.current_stem, self.current_ext = os.path.splitext(self.current_name)
++
++    def set_current_name(self, name: str) -> None:
++        self.current_name = name
++        self.current_stem, self.current_ext = os.path.splitext(name)
 +
 +    def reset(self) -> None:
-+        self.current_name = self.original_name
++        self.set_current_name(self.original_name)
 +        self.custom_template = None
 +        self.preview_name = self.original_name
 +
@@ -110,21 +337,15 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        if not os.path.exists(self._file_path):
 +            return "File does not exist."
 +        try:
-+            with Image.open(self._file_path) as img:
-+                exif_data = img.getexif() or {}
++            exif_data = _read_exif_fast(self._file_path) or {}
 +        except Exception as exc:  # pragma: no cover - best effort only
 +            return f"Unable to read EXIF data: {exc}"
 +
 +        if not exif_data:
 +            return "No EXIF metadata found."
 +
-+        tag_names: Dict[str, int] = {}
-+        if ExifTags is not None:
-+            tag_names = {v: k for k, v in ExifTags.TAGS.items()}
-+
 +        interesting = []
-+        for desired in ("DateTimeOriginal", "DateTime", "DateTimeDigitized"):
-+            key = tag_names.get(desired)
++        for desired, key in (("DateTimeOriginal", _TAG_DTO), ("DateTime", _TAG_DT), ("DateTimeDigitized", _TAG_DTD)):
 +            if key and key in exif_data:
 +                interesting.append(f"{desired}: {exif_data.get(key)}")
 +        if not interesting:
@@ -135,8 +356,8 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        return self.text_edit.text().strip()
 +
 +
-+class RenameAssistant(QWidget):
-+    """Main widget implementing the desktop tool described by the user."""
++class FileInfoModel(QAbstractTableModel):
++    """Table model exposing the assistant's FileInfo list without per-cell item objects."""
 +
 +    COL_BEFORE = 0
 +    COL_CURRENT = 1
@@ -145,6 +366,170 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +    COL_UNDO = 4
 +    COL_COMMIT = 5
 +
++    HEADERS = ("Before", "Current", "Custom", "Preview", "Undo", "Commit")
++    # Returns every role the delegates paint with as a single dict.
++    MultipleRoles = Qt.ItemDataRole.UserRole + 1
++
++    def __init__(self, file_infos: List[FileInfo], parent: QWidget | None = None):
++        super().__init__(parent)
++        self._infos = file_infos
++
++    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
++        return 0 if parent.isValid() else len(self._infos)
++
++    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
++        return 0 if parent.isValid() else len(self.HEADERS)
++
++    def _display(self, info: FileInfo, column: int) -> str:
++        if column == self.COL_BEFORE:
++            return info.original_name
++        if column == self.COL_CURRENT:
++            return info.current_name
++        if column == self.COL_CUSTOM:
++            return info.custom_template or ""
++        if column == self.COL_PREVIEW:
++            return info.preview_name
++        return self.HEADERS[column]
++
++    def _tooltip(self, column: int) -> Optional[str]:
++        if column == self.COL_CUSTOM:
++            return "Double-click to edit the custom template for this file."
++        return None
++
++    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
++        if not index.isValid() or index.row() >= len(self._infos):
++            return None
++        column = index.column()
++        if role == Qt.ItemDataRole.DisplayRole:
++            return self._display(self._infos[index.row()], column)
++        if role == Qt.ItemDataRole.ToolTipRole:
++            return self._tooltip(column)
++        if role == self.MultipleRoles:
++            return {
++                Qt.ItemDataRole.DisplayRole: self._display(self._infos[index.row()], column),
++                Qt.ItemDataRole.ToolTipRole: self._tooltip(column),
++            }
++        return None
++
++    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
++        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
++            return self.HEADERS[section]
++        return None
++
++    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
++        if not index.isValid():
++            return Qt.ItemFlag.NoItemFlags
++        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
++
++    def refresh_row(self, row: int) -> None:
++        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
++
++    def sort_by_current_name(self) -> None:
++        """Reorder rows by current name, as a fresh directory load lists them."""
++        old_order = list(self._infos)
++        self.layoutAboutToBeChanged.emit()
++        self._infos.sort(key=lambda info: info.current_name)
++        new_rows = {id(info): row for row, info in enumerate(self._infos)}
++        old_indexes = self.persistentIndexList()
++        self.changePersistentIndexList(old_indexes, [
++            self.index(new_rows[id(old_order[index.row()])], index.column()) for index in old_indexes
++        ])
++        self.layoutChanged.emit()
++
++
++class ButtonColumnDelegate(QStyledItemDelegate):
++    """Paints a push button in every cell of a column and reports clicks by row."""
++
++    clicked = pyqtSignal(int)
++
++    def __init__(self, parent: QWidget | None = None):
++        super().__init__(parent)
++        self._pressed: Optional[Tuple[int, int]] = None
++
++    def paint(self, painter, option, index: QModelIndex) -> None:
++        roles = index.data(FileInfoModel.MultipleRoles) or {}
++        button = QStyleOptionButton()
++        button.rect = option.rect.adjusted(2, 2, -2, -2)
++        button.text = roles.get(Qt.ItemDataRole.DisplayRole, "")
++        button.state = QStyle.StateFlag.State_Enabled
++        if self._pressed == (index.row(), index.column()):
++            button.state |= QStyle.StateFlag.State_Sunken
++        else:
++            button.state |= QStyle.StateFlag.State_Raised
++        style = option.widget.style() if option.widget is not None else QApplication.style()
++        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
++
++    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
++        event_type = event.type()
++        if event_type == QEvent.Type.MouseButtonDblClick:
++            return True
++        if event_type not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
++            return False
++        if event.button() != Qt.MouseButton.LeftButton:
++            return False
++        cell = (index.row(), index.column())
++        if event_type == QEvent.Type.MouseButtonPress:
++            self._pressed = cell
++        else:
++            pressed, self._pressed = self._pressed, None
++            if pressed == cell and option.rect.contains(event.position().toPoint()):
++                self.clicked.emit(index.row())
++        view = self.parent()
++        if isinstance(view, QTableView):
++            view.viewport().update(option.rect)
++        return True
++
++
++class PreviewSignals(QObject):
++    """Carries results from worker threads back to the GUI thread."""
++
++    finished = pyqtSignal(int, int, str)  # generation, row, preview
++    exif_indexed = pyqtSignal(int)  # prefetch generation
++
++
++class PreviewJob(QRunnable):
++    """Renders one custom-template preview on a worker thread, where the EXIF read happens."""
++
++    def __init__(self, assistant: RenameAssistant, signals: PreviewSignals, generation: int, row: int,
++                 info: FileInfo, sequence_counter: int):
++        super().__init__()
++        self._assistant = assistant
++        self._signals = signals
++        self._generation = generation
++        self._row = row
++        self._info = info
++        self._sequence_counter = sequence_counter
++
++    def run(self) -> None:
++        preview = self._assistant.render_template(self._info, self._sequence_counter)
++        self._signals.finished.emit(self._generation, self._row, preview)
++
++
++class ExifPrefetchJob(QRunnable):
++    """Warms the assistant's EXIF cache for one file right after a directory is loaded."""
++
++    def __init__(self, assistant: RenameAssistant, signals: PreviewSignals, generation: int, file_path: str):
++        super().__init__()
++        self._assistant = assistant
++        self._signals = signals
++        self._generation = generation
++        self._file_path = file_path
++
++    def run(self) -> None:
++        self._assistant.extract_exif_values(self._file_path)
++        self._signals.exif_indexed.emit(self._generation)
++
++
++class RenameAssistant(QWidget):
++    """Main widget implementing the desktop tool described by the user."""
++
++    COL_BEFORE = FileInfoModel.COL_BEFORE
++    COL_CURRENT = FileInfoModel.COL_CURRENT
++    COL_CUSTOM = FileInfoModel.COL_CUSTOM
++    COL_PREVIEW = FileInfoModel.COL_PREVIEW
++    COL_UNDO = FileInfoModel.COL_UNDO
++    COL_COMMIT = FileInfoModel.COL_COMMIT
++
 +    def __init__(self):
 +        super().__init__()
 +        self.setWindowTitle("Filename Replace Assistant")
@@ -152,6 +537,29 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +
 +        self.current_directory: Optional[str] = None
 +        self.file_infos: List[FileInfo] = []
++        self._exif_cache: Dict[Tuple[str, int, int], Dict[str, str]] = {}
++        self._rules_cache: Optional[Tuple[str, List[Tuple[str, str]], Optional[Pattern[str]], Dict[str, str]]] = None
++
++        self._preview_timer = QTimer(self)
++        self._preview_timer.setSingleShot(True)
++        self._preview_timer.setInterval(120)
++        self._preview_timer.timeout.connect(self._do_update_all_previews)
++
++        self._preview_pool = QThreadPool(self)
++        self._preview_pool.setMaxThreadCount(os.cpu_count() or 1)
++        self._preview_signals = PreviewSignals(self)
++        self._preview_signals.finished.connect(self._on_preview_ready)
++        self._preview_signals.exif_indexed.connect(self._on_exif_indexed)
++        self._preview_generation = 0
++        self._prefetch_generation = 0
++        self._prefetch_done = 0
++        self._prefetch_total = 0
++        # row -> sequence number of previews still being rendered in the pool
++        self._pending_previews: Dict[int, int] = {}
++        # With no rules and no templates every preview equals current_name; once a pass has
++        # established that, further passes are no-ops until something invalidates it.
++        self._any_custom_templates = False
++        self._previews_are_identity = False
 +
 +        outer = QVBoxLayout(self)
 +        path_row = QHBoxLayout()
@@ -174,14 +582,27 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        replace_row.addWidget(QLabel("Replace:", self))
 +        replace_row.addWidget(self.replace_edit, 1)
 +
-+        self.table = QTableWidget(0, 6, self)
-+        self.table.setHorizontalHeaderLabels(["Before", "Current", "Custom", "Preview", "Undo", "Commit"])
++        self.model = FileInfoModel(self.file_infos, self)
++        self.table = QTableView(self)
++        self.table.setModel(self.model)
 +        self.table.verticalHeader().setVisible(False)
-+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-+        self.table.cellDoubleClicked.connect(self.handle_cell_double_click)
++        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
++        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
++        self.table.doubleClicked.connect(self._on_double_clicked)
++
++        self.undo_delegate = ButtonColumnDelegate(self.table)
++        self.undo_delegate.clicked.connect(self.undo_row)
++        self.table.setItemDelegateForColumn(self.COL_UNDO, self.undo_delegate)
++        self.commit_delegate = ButtonColumnDelegate(self.table)
++        self.commit_delegate.clicked.connect(self.commit_row)
++        self.table.setItemDelegateForColumn(self.COL_COMMIT, self.commit_delegate)
 +        outer.addWidget(self.table, 1)
 +
++        self.index_label = QLabel(self)
++        self.index_label.setStyleSheet("color:#555;font-size:11px;")
++        self.index_label.hide()
++        outer.addWidget(self.index_label)
++
 +        hint = QLabel(
 +            "Double-click the Custom column to define an EXIF-aware template for that file.\n"
 +            "The Preview column shows the filename after applying replacement rules or the custom template."
@@ -190,6 +611,11 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        hint.setStyleSheet("color:#555;font-size:11px;")
 +        outer.addWidget(hint)
 +
++    def closeEvent(self, event) -> None:
++        # The pool's destructor waits for every queued job; drop the ones not yet started.
++        self._preview_pool.clear()
++        super().closeEvent(event)
++
 +    # ----- directory handling -------------------------------------------------
 +    def handle_manual_path(self) -> None:
 +        text = self.path_edit.text().strip()
@@ -207,51 +633,101 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        if not os.path.isdir(directory):
 +            QMessageBox.warning(self, "Invalid directory", "Selected path is not a directory.")
 +            return
-+        self.current_directory = directory
-+        self.file_infos.clear()
-+        self.table.setRowCount(0)
-+
-+        for entry in sorted(os.listdir(directory)):
-+            full_path = os.path.join(directory, entry)
-+            if not os.path.isfile(full_path):
++        with os.scandir(directory) as it:
++            entries = sorted(e.name for e in it if e.is_file())
++
++        if directory == self.current_directory:
++            self._reconcile_entries(entries)
++        else:
++            self.current_directory = directory
++            self._exif_cache.clear()
++            self.model.beginResetModel()
++            self.file_infos.clear()
++            self.file_infos.extend(FileInfo(original_name=entry, current_name=entry, preview_name=entry) for entry in entries)
++            self.model.endResetModel()
++            self._any_custom_templates = False
++            self._previews_are_identity = False
++
++        self._start_exif_prefetch()
++        self._do_update_all_previews()
++
++    def _reconcile_entries(self, entries: List[str]) -> None:
++        """Update the rows of the already loaded directory in place from a fresh listing.
++
++        Existing FileInfo objects (and their custom templates and rename history) are kept for
++        files still on disk, rows of vanished files are removed and new files are inserted at their
++        sorted positions, so rows (and ### numbering) follow the same order as a fresh load.
++        """
++        present = set(entries)
++        for row in range(len(self.file_infos) - 1, -1, -1):
++            if self.file_infos[row].current_name not in present:
++                self.model.beginRemoveRows(QModelIndex(), row, row)
++                del self.file_infos[row]
++                self.model.endRemoveRows()
++        # Files committed this session keep their old row until the next listing.
++        names = [info.current_name for info in self.file_infos]
++        if any(a > b for a, b in zip(names, names[1:])):
++            self.model.sort_by_current_name()
++        # Both lists are sorted now; wherever they differ, a run of new files starts.
++        known = set(names)
++        row = 0
++        while row < len(entries):
++            if row < len(self.file_infos) and self.file_infos[row].current_name == entries[row]:
++                row += 1
 +                continue
-+            info = FileInfo(original_name=entry, current_name=entry, preview_name=entry)
-+            self.file_infos.append(info)
-+            self._append_row(info)
-+
-+        self.update_all_previews()
-+
-+    def _append_row(self, info: FileInfo) -> None:
-+        row = self.table.rowCount()
-+        self.table.insertRow(row)
-+
-+        before_item = QTableWidgetItem(info.original_name)
-+        current_item = QTableWidgetItem(info.current_name)
-+        custom_item = QTableWidgetItem(info.custom_template or "")
-+        custom_item.setToolTip("Double-click to edit the custom template for this file.")
-+        preview_item = QTableWidgetItem(info.preview_name)
-+
-+        for item in (before_item, current_item, custom_item, preview_item):
-+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-+
-+        self.table.setItem(row, self.COL_BEFORE, before_item)
-+        self.table.setItem(row, self.COL_CURRENT, current_item)
-+        self.table.setItem(row, self.COL_CUSTOM, custom_item)
-+        self.table.setItem(row, self.COL_PREVIEW, preview_item)
++            end = row
++            while end < len(entries) and entries[end] not in known:
++                end += 1
++            self.model.beginInsertRows(QModelIndex(), row, end - 1)
++            self.file_infos[row:row] = [
++                FileInfo(original_name=entry, current_name=entry, preview_name=entry) for entry in entries[row:end]
++            ]
++            self.model.endInsertRows()
++            row = end
++        self._any_custom_templates = any(info.custom_template for info in self.file_infos)
++
++    def _start_exif_prefetch(self) -> None:
++        # Unstarted jobs of the previous listing would only fill the cache with stale entries; queued
++        # preview jobs go too, which is fine as the caller starts a new preview pass right after.
++        self._preview_pool.clear()
++        self._prefetch_generation += 1
++        self._prefetch_done = 0
++        self._prefetch_total = 0
++        if Image is None or self.current_directory is None or not self.file_infos:
++            self.index_label.hide()
++            return
++        cached = set(list(self._exif_cache))
++        for info in self.file_infos:
++            file_path = os.path.join(self.current_directory, info.current_name)
++            try:
++                stat = os.stat(file_path)
++            except OSError:
++                continue
++            if (file_path, stat.st_mtime_ns, stat.st_size) in cached:
++                continue
++            self._preview_pool.start(ExifPrefetchJob(self, self._preview_signals, self._prefetch_generation, file_path))
++            self._prefetch_total += 1
++        self._update_index_label()
 +
-+        undo_button = QPushButton("Undo", self)
-+        undo_button.clicked.connect(lambda checked=False, r=row: self.undo_row(r))
-+        commit_button = QPushButton("Commit", self)
-+        commit_button.clicked.connect(lambda checked=False, r=row: self.commit_row(r))
++    def _on_exif_indexed(self, generation: int) -> None:
++        if generation != self._prefetch_generation:
++            return
++        self._prefetch_done += 1
++        self._update_index_label()
 +
-+        self.table.setCellWidget(row, self.COL_UNDO, undo_button)
-+        self.table.setCellWidget(row, self.COL_COMMIT, commit_button)
++    def _update_index_label(self) -> None:
++        total = self._prefetch_total
++        if self._prefetch_done >= total:
++            self.index_label.hide()
++            return
++        self.index_label.setText(f"Indexing EXIF ({self._prefetch_done}/{total})")
++        self.index_label.show()
 +
 +    # ----- replacements -------------------------------------------------------
 +    def parse_rules(self) -> List[Tuple[str, str]]:
 +        text = self.replace_edit.toPlainText().strip()
-+        if not text:
-+            return []
++        if self._rules_cache is not None and self._rules_cache[0] == text:
++            return self._rules_cache[1]
 +        rules: List[Tuple[str, str]] = []
 +        for segment in text.split(';'):
 +            segment = segment.strip()
@@ -261,27 +737,78 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +                continue
 +            find, replacement = segment.split('/', 1)
 +            rules.append((find, replacement))
++        pattern = None
++        if len(rules) > 1 and _rules_are_independent(rules):
++            pattern = re.compile('|'.join(re.escape(find) for find, _ in rules))
++        self._rules_cache = (text, rules, pattern, dict(rules))
 +        return rules
 +
 +    def apply_rules(self, name: str, rules: List[Tuple[str, str]]) -> str:
++        cache = self._rules_cache
++        if cache is not None and cache[1] is rules and cache[2] is not None:
++            mapping = cache[3]
++            return cache[2].sub(lambda m: mapping[m.group(0)], name)
 +        result = name
 +        for find, replacement in rules:
 +            result = result.replace(find, replacement)
 +        return result
 +
 +    def update_all_previews(self) -> None:
++        self._preview_timer.start()
++
++    def _flush_pending_previews(self) -> None:
++        if self._preview_timer.isActive():
++            self._preview_timer.stop()
++            self._do_update_all_previews()
++
++    def _do_update_all_previews(self) -> None:
++        # Results of jobs from an earlier pass are stale once a new pass starts.
++        self._preview_generation += 1
++        self._pending_previews.clear()
 +        if not self.file_infos:
 +            return
 +        rules = self.parse_rules()
++        if not rules and not self._any_custom_templates and self._previews_are_identity:
++            return
++        self._previews_are_identity = not rules and not self._any_custom_templates
 +        sequence_counter = 1
++        changed_rows: List[int] = []
 +        for row, info in enumerate(self.file_infos):
-+            preview, used_sequence = self.compute_preview(info, rules, sequence_counter)
-+            info.preview_name = preview
-+            preview_item = self.table.item(row, self.COL_PREVIEW)
-+            if preview_item is not None:
-+                preview_item.setText(preview)
++            if info.custom_template and Image is not None and _template_needs_exif(info.custom_template):
++                self._pending_previews[row] = sequence_counter
++                # Ahead of queued EXIF prefetch jobs: the user is waiting on these.
++                self._preview_pool.start(PreviewJob(
++                    self, self._preview_signals, self._preview_generation, row, replace(info), sequence_counter,
++                ), 1)
++                used_sequence = '###' in info.custom_template
++            else:
++                preview, used_sequence = self.compute_preview(info, rules, sequence_counter)
++                if self._set_preview(row, preview, notify=False):
++                    changed_rows.append(row)
 +            if used_sequence:
 +                sequence_counter += 1
++        if changed_rows:
++            self.model.dataChanged.emit(
++                self.model.index(changed_rows[0], self.COL_PREVIEW),
++                self.model.index(changed_rows[-1], self.COL_PREVIEW),
++                [Qt.ItemDataRole.DisplayRole],
++            )
++
++    def _on_preview_ready(self, generation: int, row: int, preview: str) -> None:
++        if generation != self._preview_generation or row not in self._pending_previews:
++            return
++        del self._pending_previews[row]
++        self._set_preview(row, preview)
++
++    def _set_preview(self, row: int, preview: str, notify: bool = True) -> bool:
++        info = self.file_infos[row]
++        if preview == info.preview_name:
++            return False
++        info.preview_name = preview
++        if notify:
++            preview_index = self.model.index(row, self.COL_PREVIEW)
++            self.model.dataChanged.emit(preview_index, preview_index, [Qt.ItemDataRole.DisplayRole])
++        return True
 +
 +    def compute_preview(self, info: FileInfo, rules: List[Tuple[str, str]], sequence_counter: int) -> Tuple[str, bool]:
 +        if info.custom_template:
@@ -291,52 +818,58 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +
 +    def render_template(self, info: FileInfo, sequence_counter: int) -> str:
 +        template = info.custom_template or ""
-+        name, ext = os.path.splitext(info.original_name)
-+        current_name, current_ext = os.path.splitext(info.current_name)
-+        if not name:
-+            name = current_name
-+        ext = current_ext or ext
++        name = info.orig_stem or info.current_stem
 +
 +        replacements = {
 +            '<ORIGINAL>': name,
-+            '<EXT>': current_ext or ext,
++            '<EXT>': info.current_ext or info.orig_ext,
 +            '<EXIF_date>': '',
 +            '<EXIF_datetime>': '',
++            '###': f"{sequence_counter:03d}",
 +        }
 +
-+        if Image is not None and self.current_directory is not None:
++        if Image is not None and self.current_directory is not None and _template_needs_exif(template):
 +            file_path = os.path.join(self.current_directory, info.current_name)
 +            exif_values = self.extract_exif_values(file_path)
 +            replacements.update(exif_values)
 +
-+        result = template
-+        for placeholder, value in replacements.items():
-+            result = result.replace(placeholder, value)
-+
-+        if '###' in result:
-+            result = result.replace('###', f"{sequence_counter:03d}")
-+
-+        return result
++        return _PLACEHOLDER_RE.sub(lambda m: replacements[m.group(0)], template)
 +
 +    def extract_exif_values(self, file_path: str) -> Dict[str, str]:
++        if Image is None:
++            return {}
++        try:
++            stat = os.stat(file_path)
++        except OSError:
++            return {}
++        key = (file_path, stat.st_mtime_ns, stat.st_size)
++        cached = self._exif_cache.get(key)
++        if cached is None:
++            cached = self._exif_cache[key] = self._read_exif_values(file_path)
++        return cached
++
++    def _invalidate_exif(self, file_path: str) -> None:
++        # list() snapshots the keys atomically; pool workers may be inserting concurrently.
++        for key in [k for k in list(self._exif_cache) if k[0] == file_path]:
++            self._exif_cache.pop(key, None)
++
++    def _read_exif_values(self, file_path: str) -> Dict[str, str]:
 +        values: Dict[str, str] = {}
-+        if Image is None or not os.path.exists(file_path):
-+            return values
 +        try:
-+            with Image.open(file_path) as img:
-+                exif = img.getexif() or {}
-+        except Exception:  # pragma: no cover - best effort only
-+            return values
-+        if not exif:
-+            return values
-+
-+        tag_lookup: Dict[str, int] = {}
-+        if ExifTags is not None:
-+            tag_lookup = {v: k for k, v in ExifTags.TAGS.items()}
-+
-+        date_value = self._fetch_exif_value(exif, tag_lookup, "DateTimeOriginal") or \
-+            self._fetch_exif_value(exif, tag_lookup, "DateTime") or \
-+            self._fetch_exif_value(exif, tag_lookup, "DateTimeDigitized")
++            date_value = _fast_exif_datetime(file_path)
++        except (OSError, struct.error):
++            date_value = None
++        if date_value is None:
++            try:
++                exif = _read_exif_fast(file_path) or {}
++            except Exception:  # pragma: no cover - best effort only
++                return values
++            if not exif:
++                return values
++
++            date_value = self._fetch_exif_value(exif, _TAG_DTO) or \
++                self._fetch_exif_value(exif, _TAG_DT) or \
++                self._fetch_exif_value(exif, _TAG_DTD)
 +
 +        if date_value:
 +            date_str = date_value.replace(':', '-').replace(' ', '_')
@@ -352,8 +885,7 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        return values
 +
 +    @staticmethod
-+    def _fetch_exif_value(exif: Dict[int, object], tag_lookup: Dict[str, int], desired: str) -> Optional[str]:
-+        key = tag_lookup.get(desired)
++    def _fetch_exif_value(exif: Dict[int, object], key: Optional[int]) -> Optional[str]:
 +        if key and key in exif:
 +            value = exif.get(key)
 +            if isinstance(value, bytes):
@@ -365,6 +897,9 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        return None
 +
 +    # ----- custom template editing -------------------------------------------
++    def _on_double_clicked(self, index: QModelIndex) -> None:
++        self.handle_cell_double_click(index.row(), index.column())
++
 +    def handle_cell_double_click(self, row: int, column: int) -> None:
 +        if column != self.COL_CUSTOM:
 +            return
@@ -378,10 +913,9 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        if dialog.exec() == QDialog.DialogCode.Accepted:
 +            template = dialog.template()
 +            info.custom_template = template or None
-+            custom_item = self.table.item(row, self.COL_CUSTOM)
-+            if custom_item is not None:
-+                custom_item.setText(info.custom_template or "")
-+            self.update_all_previews()
++            self._any_custom_templates = any(i.custom_template for i in self.file_infos)
++            self.model.refresh_row(row)
++            self._do_update_all_previews()
 +
 +    # ----- undo / commit ------------------------------------------------------
 +    def undo_row(self, row: int) -> None:
@@ -405,13 +939,11 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        except OSError as exc:
 +            QMessageBox.critical(self, "Undo failed", f"Could not rename file: {exc}")
 +            return
-+        info.current_name = info.original_name
-+        self.table.item(row, self.COL_CURRENT).setText(info.current_name)
-+        if info.custom_template is None:
-+            custom_item = self.table.item(row, self.COL_CUSTOM)
-+            if custom_item is not None:
-+                custom_item.setText("")
-+        self.update_all_previews()
++        self._invalidate_exif(current_path)
++        info.set_current_name(info.original_name)
++        self._previews_are_identity = False
++        self.model.refresh_row(row)
++        self._do_update_all_previews()
 +
 +    def commit_row(self, row: int) -> None:
 +        if row >= len(self.file_infos):
@@ -419,6 +951,9 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        info = self.file_infos[row]
 +        if self.current_directory is None:
 +            return
++        self._flush_pending_previews()
++        if row in self._pending_previews:
++            self._set_preview(row, self.render_template(info, self._pending_previews.pop(row)))
 +        preview = info.preview_name
 +        if not preview:
 +            QMessageBox.warning(self, "Invalid preview", "No preview available for this file.")
@@ -439,9 +974,10 @@ index 0000000000000000000000000000000000000000..b751eee0b4f9751506fed57280b7e0f6
 +        except OSError as exc:
 +            QMessageBox.critical(self, "Commit failed", f"Could not rename file: {exc}")
 +            return
-+        info.current_name = preview
-+        self.table.item(row, self.COL_CURRENT).setText(info.current_name)
-+        self.update_all_previews()
++        self._invalidate_exif(old_path)
++        info.set_current_name(preview)
++        self.model.refresh_row(row)
++        self._do_update_all_previews()
 +
 +
 +def main() -> None:
@@ -3,14 +3,15 @@
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QTreeWidget, QTreeWidgetItem, QVBoxLayout,
     QPushButton, QHBoxLayout, QLineEdit, QFileDialog, QHeaderView, QFrame,
-    QStyledItemDelegate, QColorDialog, QComboBox, QDateEdit, QProgressBar, QStyle
+    QStyledItemDelegate, QColorDialog, QComboBox, QDateEdit, QStyle
 )
 from PyQt6.QtGui import QPalette, QColor, QPainter, QTextDocument
-from PyQt6.QtCore import Qt, QByteArray, QDate
+from PyQt6.QtCore import Qt, QByteArray, QDate, QTimer
 import sys, os, json, random, datetime, re
 
 ROLE_LEVEL = Qt.ItemDataRole.UserRole
 ROLE_CASE  = Qt.ItemDataRole.UserRole + 1
+ROLE_PROGRESS = Qt.ItemDataRole.UserRole + 2
 
 COL_PROJECT, COL_COLOR, COL_LEVEL = 0, 1, 2
 COL_ACTION = 3
@@ -29,6 +30,7 @@ HEADERS = [
 NATURES = ["BA", "PM", "OA", "Infra", "DEV"]
 PRIORITY_COLORS = {"1": "#ffb3b3", "2": "#ffd580", "3": "#b3d1ff", "4": "#b3ffb3"}
 STEP_CYCLE = ["", "WIP", "Done", "N/A"]
+STEP_COLORS = {"Done": "#d0ffd0", "WIP": "#ffcc80", "N/A": "#d9d9d9"}
 
 
 class ProjectDelegate(QStyledItemDelegate):
@@ -85,6 +87,23 @@ class ProjectDelegate(QStyledItemDelegate):
             super().paint(painter, option, index)
 
 
+class ProgressDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        pct = index.data(ROLE_PROGRESS) or 0
+        painter.save()
+        painter.fillRect(option.rect, option.palette.base().color())
+        bar = option.rect.adjusted(1, 2, -1, -2)
+        if pct > 0:
+            chunk = bar.adjusted(0, 0, -int(bar.width() * (100 - pct) / 100), 0)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#16a34a" if pct >= 100 else "#3b82f6"))
+            painter.drawRoundedRect(chunk, 3, 3)
+        painter.setPen(QColor("#000000"))
+        painter.drawText(bar, Qt.AlignmentFlag.AlignCenter, f"{pct}%")
+        painter.restore()
+
+
 class DragAwareTree(QTreeWidget):
     def __init__(self, recompute_hook=None, right_click_handler=None):
         super().__init__()
@@ -144,6 +163,9 @@ class RecordKeeper(QWidget):
         self.seq = 0
         self.color_map = {}
         self._updating = False
+        self._loading = False
+        self._save_pending = False
+        self._dirty_parents = set()
         self.column_order = None
         self.column_widths = None
         self.header_state = None
@@ -170,6 +192,7 @@ class RecordKeeper(QWidget):
         header.setSectionsMovable(True)
         self.tree.setAlternatingRowColors(False)
         self.tree.setItemDelegate(ProjectDelegate(self.tree))
+        self.tree.setItemDelegateForColumn(COL_PROGRESS, ProgressDelegate(self.tree))
         self.apply_style()
         self.set_default_widths()
         self.set_row_height()
@@ -284,17 +307,6 @@ class RecordKeeper(QWidget):
         self.tree.setItemWidget(it, COL_START, start_edit)
         self.tree.setItemWidget(it, COL_END, end_edit)
 
-        pb = QProgressBar()
-        pb.setRange(0, 100)
-        pb.setValue(0)
-        pb.setTextVisible(True)
-        pb.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        pb.setStyleSheet("""
-            QProgressBar { border: none; text-align: center; margin: 0; padding: 0; min-height: 28px; max-height: 28px; }
-            QProgressBar::chunk { margin: 0; border-radius: 3px; background-color: #3b82f6; }
-        """)
-        self.tree.setItemWidget(it, COL_PROGRESS, pb)
-
     def rebind_all_row_widgets(self):
         for it in self.iterate_items():
             if not self.tree.itemWidget(it, COL_ACTION):
@@ -358,17 +370,27 @@ class RecordKeeper(QWidget):
     def update_parent_stage_from_children(self, parent, recurse_up=False):
         if parent.childCount() == 0:
             return
-        for c in range(COL_STEP_START, COL_STEP_END + 1):
-            statuses = [parent.child(i).text(c) for i in range(parent.childCount())]
-            if all(s in ("Done", "N/A") for s in statuses if s != "") and any(s in ("Done", "N/A") for s in statuses):
-                parent.setText(c, "Done")
-                self.color_step_cell(parent, c, "Done")
-            elif all(s in ("", "WIP") for s in statuses):
-                parent.setText(c, "")
-                self.color_step_cell(parent, c, "")
+        # One pass over the children collects every step column; only changed cells are written
+        steps = range(COL_STEP_START, COL_STEP_END + 1)
+        done, wip, other = set(), set(), set()
+        for i in range(parent.childCount()):
+            child = parent.child(i)
+            for c in steps:
+                s = child.text(c)
+                if s in ("Done", "N/A"): done.add(c)
+                elif s == "WIP": wip.add(c)
+                elif s: other.add(c)
+        for c in steps:
+            if c in done and c not in wip and c not in other:
+                status = "Done"
+            elif c not in done and c not in other:
+                status = ""
             else:
-                parent.setText(c, "WIP")
-                self.color_step_cell(parent, c, "WIP")
+                status = "WIP"
+            if parent.text(c) != status:
+                parent.setText(c, status)
+            if parent.background(c).color().name() != STEP_COLORS.get(status, "#ffffff"):
+                self.color_step_cell(parent, c, status)
         self.update_progress(parent)
         if recurse_up and parent.parent():
             self.update_parent_stage_from_children(parent.parent(), recurse_up=True)
@@ -399,10 +421,7 @@ class RecordKeeper(QWidget):
                 self.apply_color_to_project(proj, color_hex)
                 it.setBackground(COL_PROJECT, QColor(color_hex))
                 self.tree.viewport().update()
-                self.save_all()
-                parent = it.parent()
-                if parent:
-                    self.update_parent_stage_from_children(parent, recurse_up=True)
+                self.schedule_save(it.parent())
 
         elif col == COL_NATURE:
             cb = QComboBox(); cb.addItems(NATURES)
@@ -425,19 +444,15 @@ class RecordKeeper(QWidget):
             self.color_step_cell(it, col, nxt)
             self.touch_last_update(it)
             self.update_progress(it)
-            self.save_all()
-            parent = it.parent()
-            if parent:
-                self.update_parent_stage_from_children(parent, recurse_up=True)
+            self.schedule_save(it.parent())
 
         elif col == COL_WEIGHT:
             w = self.parse_weight_days(it.text(COL_WEIGHT))
             se = self.tree.itemWidget(it, COL_START)
             ee = self.tree.itemWidget(it, COL_END)
             if se and ee and w is not None:
-                ee.setDate(self.add_workdays(se.date(), w))
-                it.setText(COL_END, ee.date().toString("yyyy/MM/dd"))
-                self.save_all()
+                self.set_end_date(it, ee, self.add_workdays(se.date(), w))
+                self.schedule_save()
 
         elif col == COL_PIC:
             cb = QComboBox(); cb.setEditable(True)
@@ -474,27 +489,17 @@ class RecordKeeper(QWidget):
             self.color_step_cell(it, c, nxt)
         self.touch_last_update(it)
         self.update_progress(it)
-        self.save_all()
-        parent = it.parent()
-        if parent:
-            self.update_parent_stage_from_children(parent, recurse_up=True)
+        self.schedule_save(it.parent())
 
     def color_step_cell(self, it, col, status):
-        if status == "Done":
-            it.setBackground(col, QColor("#d0ffd0"))
-        elif status == "WIP":
-            it.setBackground(col, QColor("#ffcc80"))
-        elif status == "N/A":
-            it.setBackground(col, QColor("#d9d9d9"))
-        else:
-            it.setBackground(col, QColor("#ffffff"))
+        it.setBackground(col, QColor(STEP_COLORS.get(status, "#ffffff")))
 
     def commit_combo(self, it, col, cb):
         txt = cb.currentText().strip()
         self.tree.removeItemWidget(it, col)
         it.setText(col, txt)
         self.touch_last_update(it)
-        self.save_all()
+        self.schedule_save()
 
     def commit_priority(self, it, cb):
         txt = cb.currentText().strip()
@@ -502,20 +507,30 @@ class RecordKeeper(QWidget):
         it.setText(COL_PRIORITY, txt)
         it.setBackground(COL_PRIORITY, QColor(PRIORITY_COLORS.get(txt, "#ffffff")))
         self.touch_last_update(it)
-        self.save_all()
+        self.schedule_save()
 
     def on_date_changed(self, it, is_start):
+        if self._loading or self._updating: return
         se = self.tree.itemWidget(it, COL_START)
         ee = self.tree.itemWidget(it, COL_END)
         if not se or not ee: return
         if is_start:
             w = self.parse_weight_days(it.text(COL_WEIGHT))
             if w is not None:
-                ee.setDate(self.add_workdays(se.date(), w))
+                self.set_end_date(it, ee, self.add_workdays(se.date(), w))
+        self._updating = True
         it.setText(COL_START, se.date().toString("yyyy/MM/dd"))
         it.setText(COL_END, ee.date().toString("yyyy/MM/dd"))
+        self._updating = False
         self.touch_last_update(it)
-        self.save_all()
+        self.schedule_save()
+
+    def set_end_date(self, it, ee, d):
+        # Programmatic write: keep dateChanged/itemChanged from re-entering the handlers and saving again
+        prev = self._updating; self._updating = True
+        ee.setDate(d)
+        it.setText(COL_END, d.toString("yyyy/MM/dd"))
+        self._updating = prev
 
     def parse_weight_days(self, text):
         if not text: return None
@@ -524,6 +539,9 @@ class RecordKeeper(QWidget):
 
     def add_workdays(self, qdate, n):
         d = QDate(qdate); step = 1 if n >= 0 else -1; remaining = abs(n)
+        # Any 7 days hold exactly 5 workdays: jump whole weeks, walk the last 1-5
+        weeks = max(remaining - 1, 0) // 5
+        d = d.addDays(step * 7 * weeks); remaining -= 5 * weeks
         while remaining > 0:
             d = d.addDays(step)
             if d.dayOfWeek() <= 5: remaining -= 1
@@ -542,39 +560,39 @@ class RecordKeeper(QWidget):
             self.safe_set(it, ROLE_CASE, case)
             self.tree.viewport().update()
             self.touch_last_update(it)
-            self.save_all()
+            self.schedule_save()
         elif col == COL_PRIORITY:
             txt = it.text(COL_PRIORITY).strip()
             it.setBackground(COL_PRIORITY, QColor(PRIORITY_COLORS.get(txt, "#ffffff")))
-            self.touch_last_update(it); self.save_all()
+            self.touch_last_update(it); self.schedule_save()
         elif col == COL_WEIGHT:
             w = self.parse_weight_days(it.text(COL_WEIGHT))
             se = self.tree.itemWidget(it, COL_START); ee = self.tree.itemWidget(it, COL_END)
             if se and ee and w is not None:
-                ee.setDate(self.add_workdays(se.date(), w))
-                it.setText(COL_END, ee.date().toString("yyyy/MM/dd"))
-            self.touch_last_update(it); self.save_all()
+                self.set_end_date(it, ee, self.add_workdays(se.date(), w))
+            self.touch_last_update(it); self.schedule_save()
         elif COL_STEP_START <= col <= COL_STEP_END:
-            self.touch_last_update(it); self.update_progress(it); self.save_all()
-            parent = it.parent()
-            if parent:
-                self.update_parent_stage_from_children(parent, recurse_up=True)
+            self.touch_last_update(it); self.update_progress(it); self.schedule_save(it.parent())
         else:
-            self.touch_last_update(it); self.save_all()
+            self.touch_last_update(it); self.schedule_save()
 
     def touch_last_update(self, it):
         now = datetime.datetime.now().strftime("%Y/%m/%d %H:%M")
+        prev = self._updating; self._updating = True
         it.setText(COL_LAST_UPDATE, now)
+        self._updating = prev
         self.update_idle(it)
 
     def update_idle(self, it):
         s = it.text(COL_LAST_UPDATE).strip()
         try:
             dt = datetime.datetime.strptime(s, "%Y/%m/%d %H:%M")
-            days = (datetime.datetime.now() - dt).days
-            it.setText(COL_IDLE, str(days))
+            idle = str((datetime.datetime.now() - dt).days)
         except:
-            it.setText(COL_IDLE, "")
+            idle = ""
+        prev = self._updating; self._updating = True
+        it.setText(COL_IDLE, idle)
+        self._updating = prev
 
     def refresh_all_progress_idle(self):
         for it in self.iterate_items():
@@ -589,19 +607,10 @@ class RecordKeeper(QWidget):
             if val in ("Done", "N/A"):
                 done += 1
         pct = int((done / total_steps) * 100)
-        pb = self.tree.itemWidget(it, COL_PROGRESS)
-        if pb:
-            pb.setValue(pct)
-            if pct >= 100:
-                pb.setStyleSheet("""
-                    QProgressBar { border: none; text-align: center; margin: 0; padding: 0; min-height: 28px; max-height: 28px; }
-                    QProgressBar::chunk { margin: 0; border-radius: 3px; background-color: #16a34a; }
-                """)
-            else:
-                pb.setStyleSheet("""
-                    QProgressBar { border: none; text-align: center; margin: 0; padding: 0; min-height: 28px; max-height: 28px; }
-                    QProgressBar::chunk { margin: 0; border-radius: 3px; background-color: #3b82f6; }
-                """)
+        if it.data(COL_PROGRESS, ROLE_PROGRESS) != pct:
+            prev = self._updating; self._updating = True
+            it.setData(COL_PROGRESS, ROLE_PROGRESS, pct)
+            self._updating = prev
 
     def mark_bold(self, it, bold=True):
         f = it.font(COL_PROJECT); f.setBold(bold); it.setFont(COL_PROJECT, f)
@@ -630,9 +639,10 @@ class RecordKeeper(QWidget):
                 self.update_parent_stage_from_children(it, recurse_up=False)
 
     def safe_set(self, it, role, val):
-        self._updating = True; self.tree.blockSignals(True)
+        prev = self._updating; blocked = self.tree.blockSignals(True)
+        self._updating = True
         it.setData(COL_PROJECT, role, val)
-        self.tree.blockSignals(False); self._updating = False
+        self.tree.blockSignals(blocked); self._updating = prev
 
     def apply_color_to_project(self, proj, color_hex):
         for it in self.iterate_items():
@@ -685,59 +695,92 @@ class RecordKeeper(QWidget):
             arr.append(node)
         return arr
 
-    def restore_tree(self, data, parent=None):
-        self.tree.blockSignals(True)
+    def restore_tree(self, data):
+        # Handlers stay quiet while loading; levels and parent roll-ups run once at the end
+        self._loading = True
+        blocked = self.tree.blockSignals(True)
         try:
-            for d in data:
-                proj = d["values"][COL_PROJECT]; lvl = d.get("level", 0)
-                it = self.make_item(proj, lvl)
-                for i, v in enumerate(d["values"]):
-                    if i < self.tree.columnCount(): it.setText(i, v)
-                self.safe_set(it, ROLE_CASE, d.get("case", ""))
-                if parent: parent.addChild(it)
-                else: self.tree.addTopLevelItem(it)
-                self.setup_row_widgets(it)
-
-                # Restore start / end dates
-                se = self.tree.itemWidget(it, COL_START)
-                ee = self.tree.itemWidget(it, COL_END)
-                try:
-                    sd = QDate.fromString(it.text(COL_START), "yyyy/MM/dd")
-                    ed = QDate.fromString(it.text(COL_END), "yyyy/MM/dd")
-                    if sd.isValid(): se.setDate(sd)
-                    if ed.isValid(): ee.setDate(ed)
-                except:
-                    pass
-
-                # Restore priority background
-                ptxt = it.text(COL_PRIORITY).strip()
-                it.setBackground(COL_PRIORITY, QColor(PRIORITY_COLORS.get(ptxt, "#ffffff")))
-
-                # Restore PIC (no overwrite)
-                pic_val = it.text(COL_PIC).strip()
-                if pic_val:
-                    it.setText(COL_PIC, pic_val)
-
-                # Restore color for each step and progress bar
-                for c in range(COL_STEP_START, COL_STEP_END + 1):
-                    self.color_step_cell(it, c, it.text(c))
-                self.update_progress(it)
-
-                # Mark bold and expand
-                if it.childCount() > 0:
-                    self.mark_bold(it, True)
-                it.setExpanded(True)
-
-                # Recurse children
-                if "children" in d:
-                    self.restore_tree(d["children"], it)
-
+            self.restore_items(data)
         finally:
-            self.tree.blockSignals(False)
+            self.tree.blockSignals(blocked)
+            self._loading = False
         self.tree.recompute_levels()
         self.enforce_parent_rules_all()
 
+    def restore_items(self, data, parent=None):
+        for d in data:
+            proj = d["values"][COL_PROJECT]; lvl = d.get("level", 0)
+            it = self.make_item(proj, lvl)
+            for i, v in enumerate(d["values"]):
+                if i < self.tree.columnCount(): it.setText(i, v)
+            self.safe_set(it, ROLE_CASE, d.get("case", ""))
+            if parent: parent.addChild(it)
+            else: self.tree.addTopLevelItem(it)
+            self.setup_row_widgets(it)
+
+            # Restore start / end dates
+            se = self.tree.itemWidget(it, COL_START)
+            ee = self.tree.itemWidget(it, COL_END)
+            try:
+                sd = QDate.fromString(it.text(COL_START), "yyyy/MM/dd")
+                ed = QDate.fromString(it.text(COL_END), "yyyy/MM/dd")
+                if sd.isValid(): se.setDate(sd)
+                if ed.isValid(): ee.setDate(ed)
+            except:
+                pass
+
+            # Restore priority background
+            ptxt = it.text(COL_PRIORITY).strip()
+            it.setBackground(COL_PRIORITY, QColor(PRIORITY_COLORS.get(ptxt, "#ffffff")))
+
+            # Restore PIC (no overwrite)
+            pic_val = it.text(COL_PIC).strip()
+            if pic_val:
+                it.setText(COL_PIC, pic_val)
+
+            # Restore color for each step and progress bar
+            for c in range(COL_STEP_START, COL_STEP_END + 1):
+                self.color_step_cell(it, c, it.text(c))
+            self.update_progress(it)
+
+            # Mark bold and expand
+            if it.childCount() > 0:
+                self.mark_bold(it, True)
+            it.setExpanded(True)
+
+            # Recurse children
+            if "children" in d:
+                self.restore_items(d["children"], it)
+
+    def schedule_save(self, parent=None):
+        # Edits arrive in bursts of signals; roll parents up and write the JSON once per pass
+        if parent is not None: self._dirty_parents.add(parent)
+        if not self._save_pending:
+            self._save_pending = True
+            QTimer.singleShot(0, self.flush_save)
+
+    def flush_save(self):
+        if self._save_pending: self.save_all()
+
+    def roll_up_dirty_parents(self):
+        dirty, self._dirty_parents = self._dirty_parents, set()
+        todo = set()
+        for p in dirty:
+            if p.treeWidget() is None: continue  # deleted since it was marked
+            while p is not None and p not in todo:
+                todo.add(p); p = p.parent()
+        # Deepest first, so each ancestor is rolled up once, after all of its children
+        for p in sorted(todo, key=self.item_depth, reverse=True):
+            self.update_parent_stage_from_children(p)
+
+    def item_depth(self, it):
+        d = 0
+        while it.parent(): it = it.parent(); d += 1
+        return d
+
     def save_all(self):
+        self._save_pending = False
+        self.roll_up_dirty_parents()
         self.capture_layout()
         geom_hex = self.saveGeometry().data().hex()
         data = {